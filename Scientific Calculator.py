@@ -1,16 +1,655 @@
 
 
 import ast
+import io
+import keyword
 import math
 import operator
+import random
+import string
+import time
+import tokenize
 import tkinter as tk
+from array import array
+from collections import OrderedDict, namedtuple
+from fractions import Fraction
+from functools import partial
+from itertools import repeat
 from tkinter import messagebox, font as tkfont
 
 
+# ---------------------------------------------------------------------------
+# Units and dimensional analysis
+# ---------------------------------------------------------------------------
+
+# SI base units, in the order used by dimension vectors.
+BASE_UNITS = ('m', 'kg', 's', 'A', 'K', 'mol', 'cd')
+
+_DIMENSIONS = {}
+
+
+def _dim(*exponents):
+    """Return the interned dimension vector with the given base exponents."""
+    vector = tuple(exponents) + (0,) * (len(BASE_UNITS) - len(exponents))
+    return _DIMENSIONS.setdefault(vector, vector)
+
+
+def _dim_mul(a, b):
+    return _dim(*map(operator.add, a, b))
+
+
+def _dim_div(a, b):
+    return _dim(*map(operator.sub, a, b))
+
+
+def _dim_pow(a, k):
+    exponents = [e * k for e in a]
+    if not all(float(e).is_integer() for e in exponents):
+        raise ValueError(f"Cannot raise {_describe_dim(a)} to the power {k}")
+    return _dim(*(int(e) for e in exponents))
+
+
+DIMENSIONLESS = _dim()
+LENGTH = _dim(1)
+MASS = _dim(0, 1)
+TIME = _dim(0, 0, 1)
+CURRENT = _dim(0, 0, 0, 1)
+TEMPERATURE = _dim(0, 0, 0, 0, 1)
+AMOUNT = _dim(0, 0, 0, 0, 0, 1)
+LUMINOSITY = _dim(0, 0, 0, 0, 0, 0, 1)
+AREA = _dim(2)
+VOLUME = _dim(3)
+VELOCITY = _dim(1, 0, -1)
+FREQUENCY = _dim(0, 0, -1)
+FORCE = _dim(1, 1, -2)
+ENERGY = _dim(2, 1, -2)
+POWER = _dim(2, 1, -3)
+PRESSURE = _dim(-1, 1, -2)
+CHARGE = _dim(0, 0, 1, 1)
+VOLTAGE = _dim(2, 1, -3, -1)
+RESISTANCE = _dim(2, 1, -3, -2)
+
+_SI_PREFIXES = {
+    'n': 1e-9, 'u': 1e-6, 'm': 1e-3, 'c': 1e-2,
+    'k': 1e3, 'M': 1e6, 'G': 1e9,
+}
+
+# Units that also accept the SI prefixes above (km, mg, kPa, MHz, ...).
+_PREFIXABLE_UNITS = {
+    'm': (1, LENGTH), 'g': (1e-3, MASS), 's': (1, TIME),
+    'A': (1, CURRENT), 'mol': (1, AMOUNT), 'L': (1e-3, VOLUME),
+    'Hz': (1, FREQUENCY), 'N': (1, FORCE), 'J': (1, ENERGY),
+    'W': (1, POWER), 'Pa': (1, PRESSURE), 'C': (1, CHARGE),
+    'V': (1, VOLTAGE), 'ohm': (1, RESISTANCE),
+    'eV': (1.602176634e-19, ENERGY),
+}
+
+_OTHER_UNITS = {
+    'K': (1, TEMPERATURE), 'cd': (1, LUMINOSITY),
+    'min': (60, TIME), 'h': (3600, TIME), 'day': (86400, TIME),
+    'week': (604800, TIME), 'yr': (31557600, TIME),
+    'inch': (0.0254, LENGTH), 'ft': (0.3048, LENGTH),
+    'yd': (0.9144, LENGTH), 'mi': (1609.344, LENGTH),
+    'nmi': (1852, LENGTH),
+    'ha': (1e4, AREA), 'acre': (4046.8564224, AREA),
+    'gal': (3.785411784e-3, VOLUME),
+    'lb': (0.45359237, MASS), 'oz': (0.028349523125, MASS),
+    'tonne': (1000, MASS),
+    'mph': (0.44704, VELOCITY), 'kph': (1 / 3.6, VELOCITY),
+    'knot': (1852 / 3600, VELOCITY),
+    'bar': (1e5, PRESSURE), 'atm': (101325, PRESSURE),
+    'psi': (6894.757293168361, PRESSURE),
+    'cal': (4.184, ENERGY), 'kcal': (4184, ENERGY),
+    'Wh': (3600, ENERGY), 'kWh': (3.6e6, ENERGY),
+}
+
+
+def _build_unit_table():
+    """Expand prefixes once at import time into symbol -> (factor, dim)."""
+    table = {}
+    for symbol, (factor, dim) in _PREFIXABLE_UNITS.items():
+        for prefix, scale in _SI_PREFIXES.items():
+            table[prefix + symbol] = (scale * factor, dim)
+    table.update(_PREFIXABLE_UNITS)
+    table.update(_OTHER_UNITS)
+    return table
+
+
+UNITS = _build_unit_table()
+
+# Preferred display symbols for common derived dimensions.
+_DERIVED_SYMBOLS = {
+    FORCE: 'N', ENERGY: 'J', POWER: 'W', PRESSURE: 'Pa',
+    CHARGE: 'C', VOLTAGE: 'V', RESISTANCE: 'ohm',
+}
+
+
+def format_dimension(dim):
+    """Render a dimension vector as an SI unit expression, e.g. 'm/s**2'."""
+    if dim in _DERIVED_SYMBOLS:
+        return _DERIVED_SYMBOLS[dim]
+    num, den = [], []
+    for symbol, exp in zip(BASE_UNITS, dim):
+        if exp:
+            parts = num if exp > 0 else den
+            parts.append(symbol if abs(exp) == 1 else f"{symbol}**{abs(exp)}")
+    text = '*'.join(num) or '1'
+    if den:
+        text += '/' + (den[0] if len(den) == 1 else f"({'*'.join(den)})")
+    return text
+
+
+def _describe_dim(dim):
+    return 'dimensionless' if dim is DIMENSIONLESS else format_dimension(dim)
+
+
+class Quantity:
+    """A value carrying units, stored in SI base units plus its dimension."""
+
+    __slots__ = ('value', 'dim', 'unit', 'factor')
+
+    def __init__(self, value, dim, unit=None, factor=1):
+        self.value = value
+        self.dim = dim
+        self.unit = unit or format_dimension(dim)
+        self.factor = factor
+
+    @property
+    def magnitude(self):
+        """The value expressed in ``unit`` rather than SI base units."""
+        return self.value if self.factor == 1 else self.value / self.factor
+
+    def __str__(self):
+        # Parenthesised so that it can be pasted back into an expression.
+        if self.unit[:1].isalpha():
+            return f"({self.magnitude!r} {self.unit})"
+        return f"({self.magnitude!r}*({self.unit}))"
+
+    def __repr__(self):
+        return f"Quantity({self.magnitude!r}, {self.unit!r})"
+
+
+# ---------------------------------------------------------------------------
+# Series helpers (sum / prod)
+# ---------------------------------------------------------------------------
+
+SERIES_MAX_TERMS = 2 ** 22      # numeric evaluation limit per series
+SERIES_REL_TOL = 1e-12          # agreement needed between limit estimates
+SERIES_AGREEMENT = 3            # consecutive estimates that must agree
+MAX_EXACT_DIGITS = 4000         # larger integer results raise OverflowError
+_MAX_EXACT_BITS = int(MAX_EXACT_DIGITS * math.log2(10))
+MAX_FACTORIAL = 5000            # keeps 1/factorial(k) series usable but cheap
+_FIRST_CHUNK, _MAX_CHUNK = 256, 65536
+MAX_POWER_SUM = 20              # highest power with a closed form
+
+
+def _elementwise(op, reverse=False):
+    def method(self, other):
+        other = other if isinstance(other, _Vector) else repeat(other)
+        if reverse:
+            return _Vector(map(op, other, self))
+        return _Vector(map(op, self, other))
+    return method
+
+
+class _Vector(list):
+    """A batch of values; arithmetic applies elementwise, scalars broadcast."""
+
+    __slots__ = ()
+
+    __add__ = _elementwise(operator.add)
+    __radd__ = _elementwise(operator.add, reverse=True)
+    __sub__ = _elementwise(operator.sub)
+    __rsub__ = _elementwise(operator.sub, reverse=True)
+    __mul__ = _elementwise(operator.mul)
+    __rmul__ = _elementwise(operator.mul, reverse=True)
+    __truediv__ = _elementwise(operator.truediv)
+    __rtruediv__ = _elementwise(operator.truediv, reverse=True)
+    __floordiv__ = _elementwise(operator.floordiv)
+    __rfloordiv__ = _elementwise(operator.floordiv, reverse=True)
+    __mod__ = _elementwise(operator.mod)
+    __rmod__ = _elementwise(operator.mod, reverse=True)
+    __pow__ = _elementwise(operator.pow)
+    __rpow__ = _elementwise(operator.pow, reverse=True)
+
+    def __neg__(self):
+        return _Vector(map(operator.neg, self))
+
+    def __pos__(self):
+        return self
+
+
+def _bernoulli_numbers(count):
+    """B_0 .. B_count-1 as exact fractions, with B_1 = +1/2."""
+    numbers = []
+    for m in range(count):
+        b = Fraction(1) - sum(Fraction(math.comb(m, j), m - j + 1) * numbers[j]
+                              for j in range(m))
+        numbers.append(b)
+    return numbers
+
+
+_BERNOULLI = _bernoulli_numbers(MAX_POWER_SUM + 2)
+
+
+def _power_sum(p, n):
+    """Faulhaber's formula: sum of k**p for k = 1..n (exact integer)."""
+    total = sum(math.comb(p + 1, j) * _BERNOULLI[j] * Fraction(n) ** (p + 1 - j)
+                for j in range(p + 1))
+    return int(total / (p + 1))
+
+
+def _zeta_even(p):
+    """Riemann zeta at an even positive integer p, via Bernoulli numbers."""
+    n = p // 2
+    b = _BERNOULLI[p]
+    return float((-1) ** (n + 1) * b * (2 * math.pi) ** p / (2 * math.factorial(p)))
+
+
+def _zeta_tail(s, n):
+    """Sum of k**-s for k >= n (integer s >= 2, n >= 1) by Euler-Maclaurin.
+
+    Terms below a cut-off are added directly; past it the expansion's
+    Bernoulli terms shrink like (2*pi)**-2j.
+    """
+    cutoff = max(n, 32, 2 * s)
+    head = math.fsum(k ** -s for k in range(n, cutoff))
+    parts = [cutoff ** (1 - s) / (s - 1), cutoff ** -s / 2]
+    rising = s  # s * (s+1) * ... * (s + 2j - 2)
+    for j in range(1, (MAX_POWER_SUM + 1) // 2 + 1):
+        parts.append(float(_BERNOULLI[2 * j]) / math.factorial(2 * j)
+                     * rising * cutoff ** (-s - 2 * j + 1))
+        rising *= (s + 2 * j - 1) * (s + 2 * j)
+    return head + math.fsum(parts)
+
+
+def _neumaier_add(total, compensation, value):
+    t = total + value
+    if abs(total) >= abs(value):
+        compensation += (total - t) + value
+    else:
+        compensation += (value - t) + total
+    return t, compensation
+
+
+def _series_bounds(start, stop):
+    """Validate series bounds; an infinite stop is returned as None."""
+    if isinstance(start, float):
+        if not start.is_integer():
+            raise ValueError("Series bounds must be integers")
+        start = int(start)
+    if stop == math.inf:
+        return start, None
+    if isinstance(stop, float):
+        if not stop.is_integer():
+            raise ValueError("Series bounds must be integers")
+        stop = int(stop)
+    return start, stop
+
+
+def _check_int(value):
+    """Return *value*, raising OverflowError for an over-long integer."""
+    if isinstance(value, int) and value.bit_length() > _MAX_EXACT_BITS:
+        raise OverflowError(f"Integer result exceeds {MAX_EXACT_DIGITS} digits")
+    return value
+
+
+def _check_power(base, exponent):
+    """Raise OverflowError before computing an over-long int power."""
+    if (isinstance(base, int) and abs(base) > 1
+            and exponent * math.log2(abs(base)) > _MAX_EXACT_BITS):
+        raise OverflowError(f"Integer result exceeds {MAX_EXACT_DIGITS} digits")
+
+
+def _checked_pow(base, exponent):
+    """``base ** exponent``, refusing over-long integer results up front."""
+    if isinstance(exponent, int) and exponent > 0:
+        _check_power(base, exponent)
+    return base ** exponent
+
+
+def _checked_factorial(n):
+    """math.factorial, refusing arguments whose result is too costly."""
+    if n > MAX_FACTORIAL:
+        raise OverflowError(f"factorial() argument above {MAX_FACTORIAL}")
+    return math.factorial(n)
+
+
+def _series_chunks(start, stop):
+    """Yield (lo, hi, checkpoint) index ranges covering start..stop.
+
+    Ranges grow to at most _MAX_CHUNK terms; *checkpoint* is true when hi
+    lands on start + _FIRST_CHUNK * 2**j, so infinite series see partial
+    sums at doubling term counts.
+    """
+    lo = start
+    target = start + _FIRST_CHUNK
+    while stop is None or lo <= stop:
+        if lo - start >= SERIES_MAX_TERMS:
+            raise ValueError("Series did not converge")
+        hi = min(target, lo + _MAX_CHUNK)
+        if stop is not None:
+            hi = min(hi, stop + 1)
+        yield lo, hi, hi == target
+        if hi == target:
+            target = start + 2 * (target - start)
+        lo = hi
+
+
+def _aitken(partials):
+    """One Aitken delta-squared pass, or None if the steps are not shrinking."""
+    accelerated = []
+    for a, b, c in zip(partials, partials[1:], partials[2:]):
+        d1, d2 = b - a, c - b
+        if d2 == 0:
+            accelerated.append(c)
+            continue
+        if d1 == 0 or not -1 < d2 / d1 < 1:
+            return None
+        ratio = d2 / d1
+        accelerated.append(c + d2 * ratio / (1 - ratio))
+    return accelerated
+
+
+def _limit_estimate(partials):
+    """Estimate the limit of partial sums taken at doubling term counts.
+
+    A tail decaying like a power of k (or faster) gives nearly geometric
+    differences between these checkpoints, so repeated Aitken passes
+    extrapolate it -- Richardson extrapolation with the exponent taken
+    from the data.  Passes stop once the differences stop shrinking.
+    """
+    level = partials
+    while len(level) >= 3:
+        accelerated = _aitken(level)
+        if not accelerated:
+            break
+        level = accelerated
+    return level[-1]
+
+
+def _series_limit(partials, previous):
+    """The limit of *partials* once it is settled, else None.
+
+    The last SERIES_AGREEMENT estimates (each from one more checkpoint)
+    must agree and be non-zero, so a single small chunk or a run of zero
+    terms never ends the evaluation early.  *previous* holds the partial
+    sums one term before each checkpoint; its estimate must agree too,
+    which catches series such as (-1)**k whose even partial sums settle.
+    """
+    if len(partials) <= SERIES_AGREEMENT:
+        return None
+    estimates = [_limit_estimate(partials[:n]) for n in
+                 range(len(partials) - SERIES_AGREEMENT + 1, len(partials) + 1)]
+    estimates.append(_limit_estimate(previous))
+    last = estimates[-2]
+    if last == 0 or not math.isfinite(last):
+        return None
+    if all(abs(e - last) <= SERIES_REL_TOL * abs(last) for e in estimates):
+        return last
+    return None
+
+
+def _sum_closed_form(terms, start, stop):
+    """Sum c * k**p * r**k terms over start..stop, or None if unsupported."""
+    total = 0
+    for (p, r), c in terms.items():
+        if c == 0:
+            continue
+        if r == 1 and 0 <= p <= MAX_POWER_SUM:
+            if stop is None:
+                return None
+            _check_power(max(abs(start), abs(stop)), p + 1)
+            part = _power_sum(p, stop) - _power_sum(p, start - 1)
+        elif r == 1 and p < 0:
+            if stop is not None or start < 1 or p > -2:
+                return None
+            if -p % 2 or -p > MAX_POWER_SUM or start > _FIRST_CHUNK:
+                part = _zeta_tail(-p, start)
+            else:
+                part = _zeta_even(-p) - math.fsum(k ** p for k in range(1, start))
+        elif p == 0 and r != 0:
+            if stop is None:
+                if abs(r) >= 1:
+                    return None
+                part = r ** start / (1 - r)
+            elif isinstance(r, int) and start >= 0:
+                _check_power(r, stop + 1)
+                part = (r ** start - r ** (stop + 1)) // (1 - r)
+            else:
+                part = (r ** start - r ** (stop + 1)) / (1 - r)
+        else:
+            return None
+        total += c * part
+    return _check_int(total)
+
+
+def _prod_closed_form(terms, start, stop):
+    """Product of a single c * r**k term over start..stop, or None."""
+    if stop is None or len(terms) != 1:
+        return None
+    (p, r), c = next(iter(terms.items()))
+    if p != 0:
+        return None
+    count = stop - start + 1
+    exponent = (start + stop) * count // 2
+    _check_power(c, count)
+    _check_power(r, abs(exponent))
+    return _check_int(c ** count * r ** exponent)
+
+
+def _sum_numeric(chunk_values, start, stop):
+    exact = 0
+    total = compensation = 0.0
+    partials, previous = [], []
+    for lo, hi, checkpoint in _series_chunks(start, stop):
+        values = chunk_values(lo, hi)
+        if all(type(v) is int for v in values):
+            exact = _check_int(exact + sum(values))
+        else:
+            total, compensation = _neumaier_add(total, compensation,
+                                                math.fsum(values))
+        if stop is None and checkpoint:
+            try:
+                partials.append(total + compensation + exact)
+            except OverflowError:
+                # Integer terms already past float range keep growing
+                raise ValueError("Series did not converge") from None
+            previous.append(partials[-1] - values[-1])
+            limit = _series_limit(partials, previous)
+            if limit is not None:
+                return limit
+    if total == 0 and compensation == 0:
+        return exact
+    total, compensation = _neumaier_add(total, compensation, exact)
+    return total + compensation
+
+
+def _prod_numeric(chunk_values, start, stop):
+    if stop is not None:
+        product = 1
+        for lo, hi, _ in _series_chunks(start, stop):
+            product = _check_int(product * math.prod(chunk_values(lo, hi)))
+            if product == 0:
+                break
+        return product
+    # Infinite products add logarithms instead: math.prod's rounding over
+    # millions of factors is far larger than the limit estimate tolerates.
+    negative = False
+    log_total = compensation = 0.0
+    partials, previous = [], []
+    for lo, hi, checkpoint in _series_chunks(start, stop):
+        values = chunk_values(lo, hi)
+        if 0 in values:
+            return 0
+        flips = sum(v < 0 for v in values)
+        negative ^= flips % 2 == 1
+        log_total, compensation = _neumaier_add(
+            log_total, compensation, math.fsum(math.log(abs(v)) for v in values))
+        if checkpoint:
+            magnitude = math.exp(log_total + compensation)
+            partials.append(-magnitude if negative else magnitude)
+            previous.append(partials[-1] / values[-1])
+            # Factors of a convergent product approach 1, so a chunk with
+            # negative factors means it is not settling yet.
+            limit = None if flips else _series_limit(partials, previous)
+            if limit is not None:
+                return limit
+
+
+# ---------------------------------------------------------------------------
+# Uncertainty propagation (Monte Carlo)
+# ---------------------------------------------------------------------------
+
+MC_SAMPLES = 200_000            # fixed up front, so a seed always gives one result
+MC_TIME_BUDGET = 1.0            # seconds, summary included, before a run is cut short
+MC_SUMMARY_SHARE = 0.5          # summary time allowed per second of sampling
+MC_BATCH = 2 ** 16
+MC_SEED = 1                     # default seed, so repeated runs agree
+MC_PERCENTILES = (2.5, 50, 97.5)
+_SAMPLER = '#sampler'           # env key for (rng, batch size); not a valid name
+
+
+def _normal_samples(rng, mu, sigma, n):
+    """n normal draws via Box-Muller, two per pair of uniforms."""
+    rand, log, sqrt = rng.random, math.log, math.sqrt
+    half = (n + 1) // 2
+    radius = [sigma * sqrt(-2.0 * log(1.0 - rand())) for _ in repeat(None, half)]
+    angle = [math.tau * rand() for _ in repeat(None, half)]
+    values = list(map(operator.mul, radius, map(math.cos, angle)))
+    values += map(operator.mul, radius, map(math.sin, angle))
+    del values[n:]
+    return [mu + v for v in values]
+
+
+def _uniform_samples(rng, low, high, n):
+    rand, width = rng.random, high - low
+    return [low + width * rand() for _ in repeat(None, n)]
+
+
+def _percentile(ordered, q):
+    """Linearly interpolated q-th percentile of an already sorted sequence."""
+    pos = (len(ordered) - 1) * q / 100
+    i = int(pos)
+    if i + 1 >= len(ordered):
+        return ordered[-1]
+    return ordered[i] + (ordered[i + 1] - ordered[i]) * (pos - i)
+
+
+class UncertainResult:
+    """Summary of a Monte Carlo run, in the units given by ``unit``."""
+
+    __slots__ = ('mean', 'std', 'percentiles', 'samples', 'dim', 'unit', 'factor',
+                 'truncated')
+
+    def __init__(self, values, dim, unit=None, factor=1, truncated=False):
+        ordered = sorted(values)
+        n = len(ordered)
+        mean = math.fsum(ordered) / n
+        deviations = [v - mean for v in ordered]
+        variance = math.fsum(map(operator.mul, deviations, deviations)) / max(n - 1, 1)
+        self.mean = mean / factor
+        self.std = math.sqrt(variance) / factor
+        self.percentiles = {q: _percentile(ordered, q) / factor
+                            for q in MC_PERCENTILES}
+        self.samples = n
+        self.dim = dim
+        if unit is None and dim is not DIMENSIONLESS:
+            unit = format_dimension(dim)
+        self.unit = unit
+        self.factor = factor
+        self.truncated = truncated
+
+    def __str__(self):
+        # Parenthesised so that it can be pasted back into an expression.
+        text = f"({self.mean!r} \u00b1 {self.std!r})"
+        if self.unit is None:
+            return text
+        if self.unit[:1].isalpha():
+            return f"({text} {self.unit})"
+        return f"({text}*({self.unit}))"
+
+    def __repr__(self):
+        return (f"UncertainResult(mean={self.mean!r}, std={self.std!r}, "
+                f"samples={self.samples}, unit={self.unit!r}, "
+                f"truncated={self.truncated!r})")
+
+
 # ---------------------------------------------------------------------------
 # Safe expression evaluator (replaces dangerous eval())
 # ---------------------------------------------------------------------------
 
+# A compiled sub-expression: evaluation closure, dimension, whether it
+# depends only on literals (so its value may be used at compile time), and
+# whether it evaluates to a _Vector (it depends on a series index).
+_Node = namedtuple('_Node', 'fn dim const vector')
+
+
+class CompiledExpression:
+    """An expression parsed and dimension-checked once, ready to re-run."""
+
+    __slots__ = ('source', 'variables', 'dim', 'unit', 'uncertain', '_fn')
+
+    def __init__(self, source, variables, fn, dim, unit=None, uncertain=False):
+        self.source = source
+        self.variables = variables
+        self.dim = dim
+        self.unit = unit
+        self.uncertain = uncertain
+        self._fn = fn
+
+    def __call__(self, **values):
+        if self.uncertain:
+            raise ValueError("Expression has uncertain inputs; use sample()")
+        try:
+            value = self._fn(values)
+        except KeyError as exc:
+            raise ValueError(f"Missing value for variable {exc}") from None
+        if self.unit is None:
+            return value
+        return Quantity(value, self.dim, *self.unit)
+
+    def sample(self, samples=MC_SAMPLES, seed=MC_SEED,
+               time_budget=MC_TIME_BUDGET, **values):
+        """Propagate the uncertain inputs by Monte Carlo sampling.
+
+        The expression is evaluated over batches of MC_BATCH random draws at
+        a time, so the same seed and sample count always give the same
+        result.  *time_budget* (None disables it) only guards against slow
+        expressions: before each batch the run's time, summary included, is
+        projected from the batches so far, and if it would overrun the run
+        stops there and the result is marked ``truncated``.
+        """
+        if samples < 1:
+            raise ValueError("Monte Carlo needs at least one sample")
+        rng = random.Random(seed)
+        results = array('d')
+        env = dict(values)
+        truncated = False
+        start = time.perf_counter()
+        try:
+            while len(results) < samples:
+                n = min(MC_BATCH, samples - len(results))
+                if time_budget is not None and results:
+                    elapsed = time.perf_counter() - start
+                    projected = (elapsed * (len(results) + n) / len(results)
+                                 * (1 + MC_SUMMARY_SHARE))
+                    if projected > time_budget:
+                        truncated = True
+                        break
+                env[_SAMPLER] = (rng, n)
+                batch = self._fn(env)
+                try:
+                    results.extend(batch if isinstance(batch, _Vector) else [batch] * n)
+                except TypeError:
+                    raise ValueError(
+                        "Result is not a real number for some samples") from None
+        except KeyError as exc:
+            raise ValueError(f"Missing value for variable {exc}") from None
+        unit, factor = self.unit or (None, 1)
+        return UncertainResult(results, self.dim, unit, factor, truncated)
+
+
 class SafeEvaluator:
     """Evaluates mathematical expressions safely using AST parsing."""
 
@@ -19,7 +658,7 @@ class SafeEvaluator:
         ast.Sub: operator.sub,
         ast.Mult: operator.mul,
         ast.Div: operator.truediv,
-        ast.Pow: operator.pow,
+        ast.Pow: _checked_pow,
         ast.Mod: operator.mod,
         ast.FloorDiv: operator.floordiv,
         ast.USub: operator.neg,
@@ -32,7 +671,7 @@ class SafeEvaluator:
         'sinh': math.sinh, 'cosh': math.cosh, 'tanh': math.tanh,
         'asinh': math.asinh, 'acosh': math.acosh, 'atanh': math.atanh,
         'log': math.log10, 'ln': math.log, 'log2': math.log2,
-        'sqrt': math.sqrt, 'abs': abs, 'factorial': math.factorial,
+        'sqrt': math.sqrt, 'abs': abs, 'factorial': _checked_factorial,
         'ceil': math.ceil, 'floor': math.floor, 'round': round,
         'degrees': math.degrees, 'radians': math.radians,
     }
@@ -42,53 +681,530 @@ class SafeEvaluator:
         'inf': math.inf, 'ans': 0,
     }
 
+    # sum(expr, k, start, stop) / prod(...) bind the index variable k
+    SERIES = ('sum', 'prod')
+
+    # Uncertain inputs; "a \u00b1 b" (or "a +/- b") is normal(a, b)
+    DISTRIBUTIONS = {
+        'normal': _normal_samples,
+        'uniform': _uniform_samples,
+    }
+
     def __init__(self):
         self.last_answer = 0
 
     def evaluate(self, expression):
+        compiled = self.compile(expression)
+        result = compiled.sample() if compiled.uncertain else compiled()
+        self.last_answer = result
+        return result
+
+    def compile(self, expression, variables=()):
+        """Parse and dimension-check *expression* into a CompiledExpression.
+
+        Names listed in *variables* are supplied as keyword arguments when
+        the result is called.  Unit mismatches raise ValueError here rather
+        than on every evaluation, and parts that use only literals are
+        evaluated here once.  A trailing ``in <unit>`` converts the
+        result into that unit.  Expressions with uncertain inputs are run
+        through CompiledExpression.sample() instead.
+        """
         self.CONSTANTS['ans'] = self.last_answer
+        variables = frozenset(variables)
+        scope = dict.fromkeys(variables, False)
+        # "a \u00b1 b" becomes a @ b: @ binds like *, so \u00b1 takes only its
+        # neighbours and 10 \u00b1 1 + 5 is normal(10, 1) + 5.
+        if '@' in expression:
+            raise ValueError("Unsupported operator: MatMult")
+        source = expression.replace('\u00b1', '@').replace('+/-', '@')
+        source = self._insert_unit_products(source, scope)
         try:
-            tree = ast.parse(expression, mode='eval')
+            tree = ast.parse(source, mode='eval')
         except SyntaxError as exc:
             raise ValueError(f"Invalid expression: {exc}") from exc
-        result = self._eval_node(tree.body)
-        self.last_answer = result
-        return result
 
-    def _eval_node(self, node):
+        body = tree.body
+        unit = None
+        if (isinstance(body, ast.Compare) and len(body.ops) == 1
+                and isinstance(body.ops[0], ast.In)):
+            node = self._compile_node(body.left, scope)
+            target = self._compile_node(body.comparators[0], scope)
+            if not target.const:
+                raise ValueError("Conversion target must be a fixed unit")
+            if target.dim is not node.dim:
+                raise ValueError(
+                    f"Cannot convert {_describe_dim(node.dim)} "
+                    f"to {_describe_dim(target.dim)}")
+            factor = target.fn({})
+            if not factor:
+                raise ValueError("Conversion target must be non-zero")
+            text = ast.get_source_segment(source, body.comparators[0])
+            unit = (text.strip(), factor)
+        else:
+            node = self._compile_node(body, scope)
+            if node.dim is not DIMENSIONLESS:
+                unit = (format_dimension(node.dim), 1)
+        return CompiledExpression(expression, variables, node.fn, node.dim, unit,
+                                  self._is_uncertain(body))
+
+    def _insert_unit_products(self, expression, scope):
+        """Turn quantity literals like ``2 s`` or ``3 m**2`` into ``(2*s)``.
+
+        The parentheses make a literal bind as one value, so ``10 m / 2 s``
+        means (10 m) / (2 s).
+        """
+        try:
+            tokens = list(tokenize.generate_tokens(io.StringIO(expression).readline))
+        except (tokenize.TokenError, SyntaxError):
+            return expression  # let ast.parse report the problem
+        line_starts = [0]
+        for line in expression.splitlines(keepends=True):
+            line_starts.append(line_starts[-1] + len(line))
+
+        def offset(position):
+            row, col = position
+            return line_starts[row - 1] + col
+
+        tokens = [tok for tok in tokens if tok.type not in (
+            tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT, tokenize.ENDMARKER)]
+        edits = []
+        open_parens = []
+        group_start = {}
+
+        def operand_start(end, names=False):
+            """First token of the number or group ending at *end*, or None."""
+            tok = tokens[end]
+            if tok.type == tokenize.NUMBER or (
+                    names and tok.type == tokenize.NAME
+                    and not keyword.iskeyword(tok.string)):
+                first = end
+            elif end in group_start:
+                first = group_start[end]
+                before = tokens[first - 1] if first else None
+                if (before is not None and before.type == tokenize.NAME
+                        and not keyword.iskeyword(before.string)):
+                    first -= 1  # a function call such as sqrt(...) m
+            else:
+                return None
+            # An exponent is not the literal: 10**3 m is (10**3) m
+            back = first - 1
+            if back > 0 and tokens[back].string in ('+', '-') \
+                    and tokens[back - 1].string == '**':
+                back -= 1
+            if back > 0 and tokens[back].string == '**':
+                base = operand_start(back - 1, names=True)
+                if base is not None:
+                    return base
+            return first
+
+        for i, tok in enumerate(tokens):
+            if tok.string == '(':
+                open_parens.append(i)
+            elif tok.string == ')' and open_parens:
+                group_start[i] = open_parens.pop()
+            if (i == 0 or tok.type != tokenize.NAME or tok.string not in UNITS
+                    or tok.string in scope or tok.string in self.CONSTANTS):
+                continue
+            first = operand_start(i - 1)
+            if first is None:
+                continue
+            # Include a trailing power such as m**2 or s**-1
+            last = i
+            rest = [t.string for t in tokens[i + 1:i + 4]]
+            if rest[:1] == ['**']:
+                if len(rest) > 1 and tokens[i + 2].type == tokenize.NUMBER:
+                    last = i + 2
+                elif rest[1:2] in (['-'], ['+']) and len(rest) > 2 \
+                        and tokens[i + 3].type == tokenize.NUMBER:
+                    last = i + 3
+            edits += [(offset(tokens[first].start), '('),
+                      (offset(tok.start), '*'),
+                      (offset(tokens[last].end), ')')]
+
+        for position, text in sorted(edits, key=lambda edit: edit[0], reverse=True):
+            expression = expression[:position] + text + expression[position:]
+        return expression
+
+    def _compile_node(self, node, scope):
+        compiled = self._compile_unfolded(node, scope)
+        if compiled.const and not compiled.vector:
+            # Fold literal-only parts such as 3 km/h into one value now;
+            # their errors (1/0, a divergent series) surface here too.
+            value = compiled.fn({})
+            return compiled._replace(fn=lambda env: value)
+        return compiled
+
+    def _compile_unfolded(self, node, scope):
         if isinstance(node, ast.Expression):
-            return self._eval_node(node.body)
+            return self._compile_node(node.body, scope)
         if isinstance(node, ast.Constant):
             if isinstance(node.value, (int, float)):
-                return node.value
+                value = node.value
+                return _Node(lambda env: value, DIMENSIONLESS, True, False)
             raise ValueError(f"Unsupported constant: {node.value!r}")
         if isinstance(node, ast.Name):
-            name = node.id
-            if name in self.CONSTANTS:
-                return self.CONSTANTS[name]
-            raise ValueError(f"Unknown name: {name}")
+            return self._compile_name(node.id, scope)
         if isinstance(node, ast.UnaryOp):
             op = self.OPERATORS.get(type(node.op))
             if op is None:
                 raise ValueError(f"Unsupported unary operator: {type(node.op).__name__}")
-            return op(self._eval_node(node.operand))
+            operand = self._compile_node(node.operand, scope)
+            fn = operand.fn
+            return operand._replace(fn=lambda env: op(fn(env)))
         if isinstance(node, ast.BinOp):
+            if isinstance(node.op, ast.MatMult):
+                return self._compile_distribution(
+                    'normal', [node.left, node.right], scope, label='\u00b1')
             op = self.OPERATORS.get(type(node.op))
             if op is None:
                 raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-            left = self._eval_node(node.left)
-            right = self._eval_node(node.right)
-            return op(left, right)
+            left = self._compile_node(node.left, scope)
+            right = self._compile_node(node.right, scope)
+            dim = self._binop_dim(node.op, left, right)
+            lfn, rfn = left.fn, right.fn
+            return _Node(lambda env: op(lfn(env), rfn(env)), dim,
+                         left.const and right.const,
+                         left.vector or right.vector)
         if isinstance(node, ast.Call):
             if not isinstance(node.func, ast.Name):
                 raise ValueError("Only simple function calls are supported")
             func_name = node.func.id
+            if func_name in self.SERIES:
+                return self._compile_series(func_name, node.args, scope)
+            if func_name in self.DISTRIBUTIONS:
+                return self._compile_distribution(func_name, node.args, scope)
             if func_name not in self.FUNCTIONS:
                 raise ValueError(f"Unknown function: {func_name}")
-            args = [self._eval_node(arg) for arg in node.args]
-            return self.FUNCTIONS[func_name](*args)
+            return self._compile_call(func_name, node.args, scope)
+        if isinstance(node, ast.Compare):
+            raise ValueError("Unit conversion ('in') must be the last operation")
         raise ValueError(f"Unsupported expression type: {type(node).__name__}")
 
+    def _compile_name(self, name, scope):
+        if name in scope:
+            return _Node(lambda env: env[name], DIMENSIONLESS, False, scope[name])
+        if name in self.CONSTANTS:
+            value = self.CONSTANTS[name]
+            dim = DIMENSIONLESS
+            if isinstance(value, Quantity):
+                value, dim = value.value, value.dim
+            elif isinstance(value, UncertainResult):
+                value, dim = value.mean * value.factor, value.dim
+            return _Node(lambda env: value, dim, True, False)
+        if name in UNITS:
+            factor, dim = UNITS[name]
+            return _Node(lambda env: factor, dim, True, False)
+        raise ValueError(f"Unknown name: {name}")
+
+    def _binop_dim(self, op, left, right):
+        if isinstance(op, ast.Mult):
+            return _dim_mul(left.dim, right.dim)
+        if isinstance(op, ast.Div):
+            return _dim_div(left.dim, right.dim)
+        if isinstance(op, ast.Pow):
+            if right.dim is not DIMENSIONLESS:
+                raise ValueError("Exponent must be dimensionless")
+            if left.dim is DIMENSIONLESS:
+                return DIMENSIONLESS
+            if not right.const:
+                raise ValueError("Exponent of a unit must be a fixed number")
+            return _dim_pow(left.dim, right.fn({}))
+        if left.dim is not right.dim:
+            raise ValueError(
+                f"Dimension mismatch: {_describe_dim(left.dim)} "
+                f"and {_describe_dim(right.dim)}")
+        if isinstance(op, ast.FloorDiv):
+            return DIMENSIONLESS
+        return left.dim
+
+    def _compile_call(self, func_name, arg_nodes, scope):
+        func = self.FUNCTIONS[func_name]
+        args = [self._compile_node(arg, scope) for arg in arg_nodes]
+        const = all(arg.const for arg in args)
+        vector = any(arg.vector for arg in args)
+        if func_name in ('abs', 'sqrt') and len(args) == 1:
+            dim = args[0].dim
+            if func_name == 'sqrt' and dim is not DIMENSIONLESS:
+                dim = _dim_pow(dim, 0.5)
+        else:
+            for arg in args:
+                if arg.dim is not DIMENSIONLESS:
+                    raise ValueError(
+                        f"{func_name}() needs a dimensionless argument, "
+                        f"got {format_dimension(arg.dim)}")
+            dim = DIMENSIONLESS
+        if len(args) == 1:
+            fn = args[0].fn
+            if vector:
+                return _Node(lambda env: _Vector(map(func, fn(env))), dim, const, True)
+            return _Node(lambda env: func(fn(env)), dim, const, False)
+        fns = [arg.fn for arg in args]
+        if vector:
+            def broadcast(env):
+                values = [f(env) for f in fns]
+                return _Vector(map(func, *[
+                    v if isinstance(v, _Vector) else repeat(v) for v in values]))
+            return _Node(broadcast, dim, const, True)
+        return _Node(lambda env: func(*[f(env) for f in fns]), dim, const, False)
+
+    # --- Series: sum(expr, k, start, stop) and prod(expr, k, start, stop) ---
+
+    def _compile_series(self, kind, arg_nodes, scope):
+        if len(arg_nodes) != 4 or not isinstance(arg_nodes[1], ast.Name):
+            raise ValueError(f"Usage: {kind}(expression, k, start, stop)")
+        body_node, index, start_node, stop_node = arg_nodes
+        var = index.id
+        if any(self._is_uncertain(n) for n in arg_nodes):
+            raise ValueError(f"{kind}() cannot contain uncertain values")
+
+        # A series nested inside another series' term is evaluated once per
+        # element of the enclosing index, with that index as a scalar.
+        outer = [name for name, vector in scope.items() if vector and any(
+            name in _names(n) for n in (body_node, start_node, stop_node))]
+        if outer:
+            scalar_scope = dict.fromkeys(scope, False)
+            inner = self._compile_series(kind, arg_nodes, scalar_scope)
+            return inner._replace(fn=self._per_element(inner.fn, outer), vector=True)
+
+        start = self._compile_node(start_node, scope)
+        stop = self._compile_node(stop_node, scope)
+        if start.dim is not DIMENSIONLESS or stop.dim is not DIMENSIONLESS:
+            raise ValueError(f"{kind}() bounds must be dimensionless")
+        body = self._compile_node(body_node, {**scope, var: True})
+        if kind == 'prod' and body.dim is not DIMENSIONLESS:
+            raise ValueError("prod() needs a dimensionless term")
+        terms = self._series_terms(body_node, var, scope)
+        closed_form = _sum_closed_form if kind == 'sum' else _prod_closed_form
+        numeric = _sum_numeric if kind == 'sum' else _prod_numeric
+        empty = 0 if kind == 'sum' else 1
+        start_fn, stop_fn, body_fn = start.fn, stop.fn, body.fn
+
+        def fn(env):
+            lo, hi = _series_bounds(start_fn(env), stop_fn(env))
+            if hi is not None and hi < lo:
+                return empty
+            if terms is not None:
+                result = closed_form(terms, lo, hi)
+                if result is not None:
+                    return result
+            if hi is not None and hi - lo >= SERIES_MAX_TERMS:
+                raise ValueError(
+                    f"{kind}() over more than {SERIES_MAX_TERMS} terms "
+                    "has no closed form")
+            local = dict(env)
+
+            def chunk_values(a, b):
+                local[var] = _Vector(range(a, b))
+                values = body_fn(local)
+                return values if isinstance(values, _Vector) else [values] * (b - a)
+
+            return numeric(chunk_values, lo, hi)
+
+        free = (_names(body_node) - {var}) & set(scope)
+        return _Node(fn, body.dim, start.const and stop.const and not free, False)
+
+    @staticmethod
+    def _per_element(fn, names):
+        def per_element(env):
+            local = dict(env)
+            results = _Vector()
+            for values in zip(*[env[name] for name in names]):
+                local.update(zip(names, values))
+                results.append(fn(local))
+            return results
+        return per_element
+
+    # --- Uncertain inputs ---
+
+    def _compile_distribution(self, name, arg_nodes, scope, label=None):
+        label = label or f"{name}()"
+        if len(arg_nodes) != 2:
+            raise ValueError(f"Usage: {name}(a, b)")
+        a, b = (self._compile_node(n, scope) for n in arg_nodes)
+        if not (a.const and b.const):
+            raise ValueError(f"{label} parameters must be fixed numbers")
+        if a.dim is not b.dim:
+            raise ValueError(
+                f"{label} needs matching units on both sides, "
+                "e.g. (5 \u00b1 0.1) m")
+        a_value, b_value = a.fn({}), b.fn({})
+        if name == 'normal' and b_value < 0:
+            raise ValueError("Standard deviation must not be negative")
+        if name == 'uniform' and a_value > b_value:
+            raise ValueError("uniform(low, high) needs low <= high")
+        draw = self.DISTRIBUTIONS[name]
+
+        def fn(env):
+            rng, n = env[_SAMPLER]
+            return _Vector(draw(rng, a_value, b_value, n))
+
+        return _Node(fn, a.dim, False, True)
+
+    def _is_uncertain(self, node):
+        for n in ast.walk(node):
+            if isinstance(n, ast.BinOp) and isinstance(n.op, ast.MatMult):
+                return True
+            if (isinstance(n, ast.Call) and isinstance(n.func, ast.Name)
+                    and n.func.id in self.DISTRIBUTIONS):
+                return True
+        return False
+
+    def _series_terms(self, node, var, scope):
+        """Decompose a series term into {(p, r): c} meaning sum of c*k**p*r**k.
+
+        Returns None when the term is not of that shape or its coefficients
+        are not fixed numbers; the series is then evaluated numerically.
+        """
+        if var not in _names(node):
+            compiled = self._compile_node(node, scope)
+            if not compiled.const:
+                return None
+            try:
+                return {(0, 1): compiled.fn({})}
+            except (ArithmeticError, ValueError):
+                return None
+        if isinstance(node, ast.Name):
+            return {(1, 1): 1}
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            terms = self._series_terms(node.operand, var, scope)
+            if terms is None or isinstance(node.op, ast.UAdd):
+                return terms
+            return {key: -c for key, c in terms.items()}
+        if not isinstance(node, ast.BinOp):
+            return None
+        left = self._series_terms(node.left, var, scope)
+        right = self._series_terms(node.right, var, scope)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, (ast.Add, ast.Sub)):
+            sign = 1 if isinstance(node.op, ast.Add) else -1
+            terms = dict(left)
+            for key, c in right.items():
+                terms[key] = terms.get(key, 0) + sign * c
+            return terms
+        if isinstance(node.op, ast.Mult):
+            return _multiply_terms(left, right)
+        if isinstance(node.op, ast.Div) and len(right) == 1:
+            (p, r), c = next(iter(right.items()))
+            if c == 0 or r == 0:
+                return None
+            return _multiply_terms(left, {(-p, 1 / r if r != 1 else 1): 1 / c})
+        if isinstance(node.op, ast.Pow):
+            return _power_terms(left, right)
+        return None
+
+
+def _names(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _multiply_terms(left, right):
+    terms = {}
+    for (p1, r1), c1 in left.items():
+        for (p2, r2), c2 in right.items():
+            key = (p1 + p2, r1 * r2)
+            terms[key] = terms.get(key, 0) + c1 * c2
+    return terms
+
+
+def _power_terms(base, exponent):
+    """Terms of base**exponent when that stays within c*k**p*r**k form."""
+    if set(exponent) == {(0, 1)}:
+        n = exponent[(0, 1)]
+        if isinstance(n, float) and n.is_integer():
+            n = int(n)
+        if not isinstance(n, int):
+            return None
+        if len(base) == 1:
+            (p, r), c = next(iter(base.items()))
+            if n < 0 and (c == 0 or r == 0):
+                return None
+            return {(p * n, r ** n): c ** n}
+        if not 0 <= n <= MAX_POWER_SUM:
+            return None
+        terms = {(0, 1): 1}
+        for _ in range(n):
+            terms = _multiply_terms(terms, base)
+        return terms
+    # r ** (a*k + b) == r**b * (r**a)**k for a fixed base r
+    if set(base) == {(0, 1)} and set(exponent) <= {(0, 1), (1, 1)}:
+        r = base[(0, 1)]
+        a, b = exponent.get((1, 1), 0), exponent.get((0, 1), 0)
+        if r == 0:
+            return None
+        return {(0, r ** a): r ** b}
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Function tables
+# ---------------------------------------------------------------------------
+
+TABLE_BLOCK_ROWS = 256
+TABLE_CACHE_BLOCKS = 64
+
+
+class FunctionTable:
+    """Rows (x, f(x)) for x = start + i*step, generated on demand.
+
+    Rows are computed a block at a time and only the most recently used
+    blocks are kept, so memory stays bounded however many rows there are.
+    A row whose value cannot be computed holds the exception instead.
+    """
+
+    def __init__(self, compiled, start, step, rows):
+        if compiled.uncertain:
+            raise ValueError("Tables need an expression without uncertain inputs")
+        if step == 0:
+            raise ValueError("Table step must not be zero")
+        if rows < 1:
+            raise ValueError("Table needs at least one row")
+        self.compiled = compiled
+        self.start = start
+        self.step = step
+        self.rows = rows
+        self._blocks = OrderedDict()
+
+    def x(self, index):
+        return self.start + index * self.step
+
+    def index_of(self, x):
+        """Row whose x is closest to *x*, clamped to the table."""
+        index = round((x - self.start) / self.step)
+        return min(max(index, 0), self.rows - 1)
+
+    def window(self, first, count):
+        """Rows first .. first+count-1 as (x, y) pairs (fewer at the end)."""
+        index = max(first, 0)
+        last = min(index + count, self.rows)
+        result = []
+        while index < last:
+            block, offset = divmod(index, TABLE_BLOCK_ROWS)
+            rows = self._block(block)[offset:offset + last - index]
+            result.extend(rows)
+            index += len(rows)
+        return result
+
+    def _block(self, block):
+        rows = self._blocks.get(block)
+        if rows is not None:
+            self._blocks.move_to_end(block)
+            return rows
+        first = block * TABLE_BLOCK_ROWS
+        last = min(first + TABLE_BLOCK_ROWS, self.rows)
+        rows = [self._row(i) for i in range(first, last)]
+        self._blocks[block] = rows
+        if len(self._blocks) > TABLE_CACHE_BLOCKS:
+            self._blocks.popitem(last=False)
+        return rows
+
+    def _row(self, index):
+        x = self.x(index)
+        try:
+            return x, _check_int(self.compiled(x=x))
+        except (ArithmeticError, ValueError, TypeError) as exc:
+            return x, exc
+
 
 # ---------------------------------------------------------------------------
 # Color theme
@@ -125,6 +1241,104 @@ THEME = {
     'border':         '#2d2d44',
 }
 
+# Button style -> (background, foreground, hover) theme keys
+BUTTON_STYLES = {
+    'number':   ('number_bg', 'number_fg', 'number_hover'),
+    'operator': ('operator_bg', 'operator_fg', 'operator_hover'),
+    'func':     ('func_bg', 'func_fg', 'func_hover'),
+    'mode':     ('func_bg', 'mode_active', 'func_hover'),
+    'memory':   ('memory_bg', 'memory_fg', 'memory_hover'),
+    'clear':    ('clear_bg', 'clear_fg', 'clear_hover'),
+    'equal':    ('equal_bg', 'equal_fg', 'equal_hover'),
+}
+
+
+# ---------------------------------------------------------------------------
+# Keypad layout
+# ---------------------------------------------------------------------------
+
+# One entry per button.  ``action`` names a ScientificCalculator method that
+# is called with ``arg`` (if given); ``font`` is 'func', 'btn' or 'small';
+# ``name`` registers the button in ScientificCalculator.keypad.
+Key = namedtuple('Key', 'label row col action arg style font span name',
+                 defaults=(None, 'func', 'func', 1, None))
+
+KEYPAD = (
+    # --- Row 0: Mode + Memory ---
+    Key("DEG", 0, 0, 'toggle_mode', style='mode', name='mode'),
+    Key("2nd", 0, 1, 'toggle_second'),
+    Key("MC", 0, 2, 'mem_clear', style='memory'),
+    Key("MR", 0, 3, 'mem_recall', style='memory'),
+    Key("M+", 0, 4, 'mem_add', style='memory'),
+    Key("M-", 0, 5, 'mem_sub', style='memory'),
+    Key("Ans", 0, 6, 'insert', "ans", style='memory'),
+    Key("C", 0, 7, 'clear', style='clear'),
+    Key("⌫", 0, 8, 'backspace', style='clear'),
+
+    # --- Row 1: Scientific functions + 7 8 9 ---
+    Key("sin", 1, 0, 'insert_func', "sin", name='sin'),
+    Key("cos", 1, 1, 'insert_func', "cos", name='cos'),
+    Key("tan", 1, 2, 'insert_func', "tan", name='tan'),
+    Key("x!", 1, 3, 'apply_unary_func', "factorial"),
+    Key("x\u00b2", 1, 4, 'insert', "**2"),
+    Key("7", 1, 5, 'insert', "7", style='number', font='btn'),
+    Key("8", 1, 6, 'insert', "8", style='number', font='btn'),
+    Key("9", 1, 7, 'insert', "9", style='number', font='btn'),
+    Key("\u00f7", 1, 8, 'insert', "/", style='operator', font='btn'),
+
+    # --- Row 2: More functions + 4 5 6 ---
+    Key("sin\u207b\u00b9", 2, 0, 'insert_func', "asin", name='asin'),
+    Key("cos\u207b\u00b9", 2, 1, 'insert_func', "acos", name='acos'),
+    Key("tan\u207b\u00b9", 2, 2, 'insert_func', "atan", name='atan'),
+    Key("\u221ax", 2, 3, 'insert_func', "sqrt"),
+    Key("x\u00b3", 2, 4, 'insert', "**3"),
+    Key("4", 2, 5, 'insert', "4", style='number', font='btn'),
+    Key("5", 2, 6, 'insert', "5", style='number', font='btn'),
+    Key("6", 2, 7, 'insert', "6", style='number', font='btn'),
+    Key("\u00d7", 2, 8, 'insert', "*", style='operator', font='btn'),
+
+    # --- Row 3: Logs + constants + 1 2 3 ---
+    Key("ln", 3, 0, 'insert_func', "ln"),
+    Key("log", 3, 1, 'insert_func', "log"),
+    Key("log\u2082", 3, 2, 'insert_func', "log2"),
+    Key("\u03c0", 3, 3, 'insert', "pi"),
+    Key("e", 3, 4, 'insert', "e"),
+    Key("1", 3, 5, 'insert', "1", style='number', font='btn'),
+    Key("2", 3, 6, 'insert', "2", style='number', font='btn'),
+    Key("3", 3, 7, 'insert', "3", style='number', font='btn'),
+    Key("-", 3, 8, 'insert', "-", style='operator', font='btn'),
+
+    # --- Row 4: Utilities + ( ) . + ---
+    Key("1/x", 4, 0, 'apply_unary', "1/"),
+    Key("|x|", 4, 1, 'insert_func', "abs"),
+    Key("%", 4, 2, 'insert', "%"),
+    Key("x\u02b8", 4, 3, 'insert', "**"),
+    Key("\u00b1", 4, 4, 'negate'),
+    Key("(", 4, 5, 'insert', "(", style='number', font='small'),
+    Key(")", 4, 6, 'insert', ")", style='number', font='small'),
+    Key(".", 4, 7, 'insert', ".", style='number', font='btn'),
+    Key("+", 4, 8, 'insert', "+", style='operator', font='btn'),
+
+    # --- Row 5: Bottom row ---
+    Key("//", 5, 0, 'insert', "//"),
+    Key("round", 5, 1, 'insert_func', "round"),
+    Key("\u230a \u230b", 5, 2, 'insert_func', "floor"),
+    Key("\u2308 \u2309", 5, 3, 'insert_func', "ceil"),
+    Key("Copy", 5, 4, 'copy_result'),
+    Key("0", 5, 5, 'insert', "0", style='number', font='btn', span=3),
+    Key("=", 5, 8, 'evaluate', style='equal', font='btn'),
+)
+
+# 2nd mode: keypad name -> (label, function) shown while 2nd is active
+SECOND_FUNCTIONS = {
+    'sin': ("sinh", "sinh"),
+    'cos': ("cosh", "cosh"),
+    'tan': ("tanh", "tanh"),
+    'asin': ("sinh\u207b\u00b9", "asinh"),
+    'acos': ("cosh\u207b\u00b9", "acosh"),
+    'atan': ("tanh\u207b\u00b9", "atanh"),
+}
+
 
 # ---------------------------------------------------------------------------
 # Main calculator class
@@ -146,10 +1360,37 @@ class ScientificCalculator:
         self.result_displayed = False
         self.second_mode = False
 
+        self.keypad = {}
+        self._hover_colors = {}
+        self.history_list = None
+        self.deferred_scheduled = False
+        self.deferred_built = False
+        self.table = None
+        self.table_frame = None
+        self._table_top = 0
+        self._table_visible = 1
+        self._table_render_pending = False
+
         self._build_fonts()
         self._build_ui()
         self._bind_keys()
 
+        # Everything not needed for the first frame is built once the
+        # window is visible.
+        self.root.bind("<Visibility>", self._on_first_visible, add="+")
+
+    def _on_first_visible(self, event):
+        if event.widget is not self.root or self.deferred_scheduled:
+            return
+        self.deferred_scheduled = True
+        self.root.after_idle(self._build_deferred)
+
+    def _build_deferred(self):
+        self.font_history = tkfont.Font(family="Consolas", size=11)
+        self._build_history(self.hist_frame)
+        self._update_history_list()
+        self.deferred_built = True
+
     # --- Fonts ---
 
     def _build_fonts(self):
@@ -158,13 +1399,13 @@ class ScientificCalculator:
         self.font_btn = tkfont.Font(family="Segoe UI", size=16)
         self.font_btn_sm = tkfont.Font(family="Segoe UI", size=12)
         self.font_func = tkfont.Font(family="Segoe UI", size=12, weight="bold")
-        self.font_history = tkfont.Font(family="Consolas", size=11)
 
     # --- UI Construction ---
 
     def _build_ui(self):
         main = tk.Frame(self.root, bg=THEME['bg'])
         main.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+        self.main_frame = main
 
         main.columnconfigure(0, weight=3)
         main.columnconfigure(1, weight=1)
@@ -178,8 +1419,9 @@ class ScientificCalculator:
         self._build_display(calc_frame)
         self._build_buttons(calc_frame)
 
-        # Right: history
-        self._build_history(main)
+        # Right: history (filled in by _build_deferred)
+        self.hist_frame = tk.Frame(main, bg=THEME['history_bg'], padx=6, pady=6)
+        self.hist_frame.grid(row=0, column=1, sticky="nsew", padx=(4, 2), pady=2)
 
     def _build_display(self, parent):
         disp_frame = tk.Frame(parent, bg=THEME['display_bg'], padx=12, pady=8)
@@ -235,10 +1477,17 @@ class ScientificCalculator:
         )
         btn.grid(row=row, column=col, columnspan=colspan,
                  sticky="nsew", padx=1, pady=1)
-        btn.bind("<Enter>", lambda e, b=btn, h=hover: b.configure(bg=h))
-        btn.bind("<Leave>", lambda e, b=btn, o=bg: b.configure(bg=o))
+        # Hover is handled once per class (see _build_buttons), not per widget
+        btn.bindtags((str(btn), "CalcButton") + btn.bindtags()[1:])
+        self._hover_colors[str(btn)] = (bg, hover)
         return btn
 
+    def _on_btn_enter(self, event):
+        event.widget.configure(bg=self._hover_colors[str(event.widget)][1])
+
+    def _on_btn_leave(self, event):
+        event.widget.configure(bg=self._hover_colors[str(event.widget)][0])
+
     def _build_buttons(self, parent):
         btn_frame = tk.Frame(parent, bg=THEME['bg'])
         btn_frame.grid(row=1, column=0, sticky="nsew", padx=2, pady=2)
@@ -249,137 +1498,24 @@ class ScientificCalculator:
         for r in range(6):
             btn_frame.rowconfigure(r, weight=1)
 
-        mk = self._make_btn
-        F = self.font_func
-        S = self.font_btn_sm
-
-        # --- Row 0: Mode + Memory ---
-        self.mode_btn = mk(btn_frame, "DEG", 0, 0, self.toggle_mode,
-                           THEME['func_bg'], THEME['mode_active'],
-                           THEME['func_hover'], font=F)
-        mk(btn_frame, "2nd", 0, 1, self.toggle_second,
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "MC", 0, 2, self.mem_clear,
-           THEME['memory_bg'], THEME['memory_fg'], THEME['memory_hover'], font=F)
-        mk(btn_frame, "MR", 0, 3, self.mem_recall,
-           THEME['memory_bg'], THEME['memory_fg'], THEME['memory_hover'], font=F)
-        mk(btn_frame, "M+", 0, 4, self.mem_add,
-           THEME['memory_bg'], THEME['memory_fg'], THEME['memory_hover'], font=F)
-        mk(btn_frame, "M-", 0, 5, self.mem_sub,
-           THEME['memory_bg'], THEME['memory_fg'], THEME['memory_hover'], font=F)
-        mk(btn_frame, "Ans", 0, 6, lambda: self.insert("ans"),
-           THEME['memory_bg'], THEME['memory_fg'], THEME['memory_hover'], font=F)
-        mk(btn_frame, "C", 0, 7, self.clear,
-           THEME['clear_bg'], THEME['clear_fg'], THEME['clear_hover'], font=F)
-        mk(btn_frame, "⌫", 0, 8, self.backspace,
-           THEME['clear_bg'], THEME['clear_fg'], THEME['clear_hover'], font=F)
-
-        # --- Row 1: Scientific functions ---
-        self.func_buttons_row1 = {}
-        self.func_buttons_row1['sin'] = mk(
-            btn_frame, "sin", 1, 0, lambda: self.insert_func("sin"),
-            THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        self.func_buttons_row1['cos'] = mk(
-            btn_frame, "cos", 1, 1, lambda: self.insert_func("cos"),
-            THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        self.func_buttons_row1['tan'] = mk(
-            btn_frame, "tan", 1, 2, lambda: self.insert_func("tan"),
-            THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "x!", 1, 3, lambda: self.apply_unary_func("factorial"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "x\u00b2", 1, 4, lambda: self.insert("**2"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-
-        # Numbers 7 8 9 + operators
-        for i, d in enumerate(["7", "8", "9"]):
-            mk(btn_frame, d, 1, 5 + i, lambda v=d: self.insert(v),
-               THEME['number_bg'], THEME['number_fg'], THEME['number_hover'])
-        mk(btn_frame, "\u00f7", 1, 8, lambda: self.insert("/"),
-           THEME['operator_bg'], THEME['operator_fg'], THEME['operator_hover'])
-
-        # --- Row 2: More functions ---
-        self.func_buttons_row2 = {}
-        self.func_buttons_row2['asin'] = mk(
-            btn_frame, "sin\u207b\u00b9", 2, 0, lambda: self.insert_func("asin"),
-            THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        self.func_buttons_row2['acos'] = mk(
-            btn_frame, "cos\u207b\u00b9", 2, 1, lambda: self.insert_func("acos"),
-            THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        self.func_buttons_row2['atan'] = mk(
-            btn_frame, "tan\u207b\u00b9", 2, 2, lambda: self.insert_func("atan"),
-            THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "\u221ax", 2, 3, lambda: self.insert_func("sqrt"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "x\u00b3", 2, 4, lambda: self.insert("**3"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-
-        for i, d in enumerate(["4", "5", "6"]):
-            mk(btn_frame, d, 2, 5 + i, lambda v=d: self.insert(v),
-               THEME['number_bg'], THEME['number_fg'], THEME['number_hover'])
-        mk(btn_frame, "\u00d7", 2, 8, lambda: self.insert("*"),
-           THEME['operator_bg'], THEME['operator_fg'], THEME['operator_hover'])
-
-        # --- Row 3: Logs + constants ---
-        mk(btn_frame, "ln", 3, 0, lambda: self.insert_func("ln"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "log", 3, 1, lambda: self.insert_func("log"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "log\u2082", 3, 2, lambda: self.insert_func("log2"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "\u03c0", 3, 3, lambda: self.insert("pi"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "e", 3, 4, lambda: self.insert("e"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-
-        for i, d in enumerate(["1", "2", "3"]):
-            mk(btn_frame, d, 3, 5 + i, lambda v=d: self.insert(v),
-               THEME['number_bg'], THEME['number_fg'], THEME['number_hover'])
-        mk(btn_frame, "-", 3, 8, lambda: self.insert("-"),
-           THEME['operator_bg'], THEME['operator_fg'], THEME['operator_hover'])
-
-        # --- Row 4: Utilities + 0 ---
-        mk(btn_frame, "1/x", 4, 0, lambda: self.apply_unary("1/"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "|x|", 4, 1, lambda: self.insert_func("abs"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "%", 4, 2, lambda: self.insert("%"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "x\u02b8", 4, 3, lambda: self.insert("**"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "\u00b1", 4, 4, self.negate,
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-
-        mk(btn_frame, "(", 4, 5, lambda: self.insert("("),
-           THEME['number_bg'], THEME['number_fg'], THEME['number_hover'], font=S)
-        mk(btn_frame, ")", 4, 6, lambda: self.insert(")"),
-           THEME['number_bg'], THEME['number_fg'], THEME['number_hover'], font=S)
-        mk(btn_frame, ".", 4, 7, lambda: self.insert("."),
-           THEME['number_bg'], THEME['number_fg'], THEME['number_hover'])
-        mk(btn_frame, "+", 4, 8, lambda: self.insert("+"),
-           THEME['operator_bg'], THEME['operator_fg'], THEME['operator_hover'])
-
-        # --- Row 5: Bottom row ---
-        mk(btn_frame, "//", 5, 0, lambda: self.insert("//"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "round", 5, 1, lambda: self.insert_func("round"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "\u230a \u230b", 5, 2, lambda: self.insert_func("floor"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "\u2308 \u2309", 5, 3, lambda: self.insert_func("ceil"),
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-        mk(btn_frame, "Copy", 5, 4, self.copy_result,
-           THEME['func_bg'], THEME['func_fg'], THEME['func_hover'], font=F)
-
-        mk(btn_frame, "0", 5, 5, lambda: self.insert("0"),
-           THEME['number_bg'], THEME['number_fg'], THEME['number_hover'],
-           colspan=3)
-        mk(btn_frame, "=", 5, 8, self.evaluate,
-           THEME['equal_bg'], THEME['equal_fg'], THEME['equal_hover'])
-
-    def _build_history(self, parent):
-        hist_frame = tk.Frame(parent, bg=THEME['history_bg'], padx=6, pady=6)
-        hist_frame.grid(row=0, column=1, sticky="nsew", padx=(4, 2), pady=2)
-
+        self.root.bind_class("CalcButton", "<Enter>", self._on_btn_enter)
+        self.root.bind_class("CalcButton", "<Leave>", self._on_btn_leave)
+
+        fonts = {'func': self.font_func, 'btn': self.font_btn,
+                 'small': self.font_btn_sm}
+        for key in KEYPAD:
+            command = getattr(self, key.action)
+            if key.arg is not None:
+                command = partial(command, key.arg)
+            bg, fg, hover = (THEME[k] for k in BUTTON_STYLES[key.style])
+            btn = self._make_btn(btn_frame, key.label, key.row, key.col,
+                                 command, bg, fg, hover, colspan=key.span,
+                                 font=fonts[key.font])
+            if key.name:
+                self.keypad[key.name] = btn
+        self.mode_btn = self.keypad['mode']
+
+    def _build_history(self, hist_frame):
         header = tk.Frame(hist_frame, bg=THEME['history_bg'])
         header.pack(fill=tk.X)
         tk.Label(
@@ -392,6 +1528,12 @@ class ScientificCalculator:
             activebackground=THEME['history_bg'], cursor="hand2",
             command=self.clear_history
         ).pack(side=tk.RIGHT)
+        tk.Button(
+            header, text="Table", font=("Segoe UI", 9), fg=THEME['history_fg'],
+            bg=THEME['history_bg'], bd=0, activeforeground=THEME['history_hl'],
+            activebackground=THEME['history_bg'], cursor="hand2",
+            command=self.toggle_table
+        ).pack(side=tk.RIGHT, padx=(0, 6))
 
         self.history_list = tk.Listbox(
             hist_frame, font=self.font_history, fg=THEME['history_fg'],
@@ -405,6 +1547,57 @@ class ScientificCalculator:
         self.history_list.pack(fill=tk.BOTH, expand=True)
         self.history_list.bind("<Double-1>", self._history_click)
 
+    def _build_table(self, parent):
+        frame = tk.Frame(parent, bg=THEME['history_bg'], padx=6, pady=6)
+        self.table_frame = frame
+
+        tk.Label(
+            frame, text="Table", font=("Segoe UI", 12, "bold"),
+            fg=THEME['history_hl'], bg=THEME['history_bg'], anchor="w"
+        ).pack(fill=tk.X)
+
+        controls = tk.Frame(frame, bg=THEME['history_bg'])
+        controls.pack(fill=tk.X, pady=(4, 4))
+        self.table_vars = {}
+        fields = (("f(x)", 'expr', "x**2"), ("start", 'start', "0"),
+                  ("step", 'step', "1"), ("rows", 'rows', "10**7"),
+                  ("go to x", 'jump', ""))
+        for row, (label, key, default) in enumerate(fields):
+            tk.Label(
+                controls, text=label, font=("Segoe UI", 9),
+                fg=THEME['history_fg'], bg=THEME['history_bg'], anchor="w"
+            ).grid(row=row, column=0, sticky="w")
+            var = tk.StringVar(value=default)
+            entry = tk.Entry(
+                controls, textvariable=var, font=self.font_history, width=14,
+                fg=THEME['display_fg'], bg=THEME['display_bg'], bd=0,
+                insertbackground=THEME['display_fg']
+            )
+            entry.grid(row=row, column=1, sticky="ew", padx=(4, 0), pady=1)
+            # Keep typing here from reaching the calculator's key bindings
+            entry.bindtags((str(entry), "Entry", "all"))
+            entry.bind("<Return>", lambda e, k=key: (
+                self._table_jump() if k == 'jump' else self._table_apply()))
+            self.table_vars[key] = var
+        controls.columnconfigure(1, weight=1)
+
+        body = tk.Frame(frame, bg=THEME['history_bg'])
+        body.pack(fill=tk.BOTH, expand=True)
+        self.table_list = tk.Listbox(
+            body, font=self.font_history, fg=THEME['history_fg'],
+            bg=THEME['history_bg'], bd=0, highlightthickness=0,
+            selectbackground=THEME['func_bg'], selectforeground=THEME['display_fg'],
+            activestyle="none"
+        )
+        self.table_scrollbar = tk.Scrollbar(body, command=self._table_scroll)
+        self.table_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.table_list.pack(fill=tk.BOTH, expand=True)
+        self.table_list.bind("<Configure>", self._table_resize)
+        self.table_list.bind("<MouseWheel>", self._table_wheel)
+        self.table_list.bind("<Button-4>", self._table_wheel)
+        self.table_list.bind("<Button-5>", self._table_wheel)
+        self.table_list.bind("<Double-1>", self._table_click)
+
     # --- Keyboard Bindings ---
 
     def _bind_keys(self):
@@ -423,11 +1616,16 @@ class ScientificCalculator:
             'period': '.', 'KP_Add': '+', 'KP_Subtract': '-',
             'KP_Multiply': '*', 'KP_Divide': '/', 'KP_Decimal': '.',
             'parenleft': '(', 'parenright': ')', 'percent': '%',
-            'asciicircum': '**',
+            'asciicircum': '**', 'comma': ',',
         }
         for key, val in key_map.items():
             self.root.bind(f"<{key}>", lambda e, v=val: self.insert(v))
 
+        # Letters and space for unit names and "in <unit>" conversions
+        for letter in string.ascii_letters:
+            self.root.bind(f"<Key-{letter}>", lambda e, v=letter: self.insert(v))
+        self.root.bind("<space>", lambda e: self.insert(" "))
+
         self.root.bind("<Control-c>", lambda e: self.copy_result())
         self.root.bind("<Control-v>", lambda e: self._paste())
 
@@ -507,6 +1705,11 @@ class ScientificCalculator:
 
         try:
             result = self.evaluator.evaluate(eval_expr)
+            # Formatting can fail as well: str() refuses very long integers.
+            formatted = self._format_result(result)
+            new_expression = str(result)
+            spread = (self._format_spread(result)
+                      if isinstance(result, UncertainResult) else None)
         except ZeroDivisionError:
             messagebox.showerror("Math Error", "Division by zero")
             return
@@ -520,10 +1723,12 @@ class ScientificCalculator:
             messagebox.showerror("Error", f"Calculation failed: {exc}")
             return
 
-        formatted = self._format_result(result)
         display_expr = self._format_expression(raw_expr)
-        self.expr_var.set(f"{display_expr} =")
-        self.expression = str(result)
+        if spread is not None:
+            self.expr_var.set(f"{display_expr} =   {spread}")
+        else:
+            self.expr_var.set(f"{display_expr} =")
+        self.expression = new_expression
         self._set_display(formatted)
         self.result_displayed = True
 
@@ -611,7 +1816,7 @@ class ScientificCalculator:
     def _format_expression(self, expr):
         """Make the raw expression more readable."""
         replacements = [
-            ('**', '^'), ('pi', '\u03c0'), ('sqrt', '\u221a'),
+            ('+/-', '\u00b1'), ('**', '^'), ('pi', '\u03c0'), ('sqrt', '\u221a'),
             ('*', '\u00d7'), ('/', '\u00f7'),
         ]
         display = expr
@@ -620,6 +1825,15 @@ class ScientificCalculator:
         return display
 
     def _format_result(self, value):
+        if isinstance(value, UncertainResult):
+            text = (f"{self._format_result(value.mean)} \u00b1 "
+                    f"{self._format_result(value.std)}")
+            if value.unit is not None:
+                text += " " + value.unit.replace('**', '^')
+            return text
+        if isinstance(value, Quantity):
+            unit = value.unit.replace('**', '^')
+            return f"{self._format_result(value.magnitude)} {unit}"
         if isinstance(value, float):
             if value == float('inf'):
                 return "\u221e"
@@ -633,6 +1847,13 @@ class ScientificCalculator:
             return formatted
         return str(value)
 
+    def _format_spread(self, result):
+        """Percentiles and sample count of a Monte Carlo result."""
+        parts = [f"p{q:g}={self._format_result(v)}"
+                 for q, v in result.percentiles.items()]
+        cut = ", cut short" if result.truncated else ""
+        return f"[{', '.join(parts)}; n={result.samples}{cut}]"
+
     # --- Mode Toggles ---
 
     def toggle_mode(self):
@@ -646,39 +1867,15 @@ class ScientificCalculator:
 
     def toggle_second(self):
         self.second_mode = not self.second_mode
-        if self.second_mode:
-            self.second_label.config(text="2nd")
-            # Swap trig labels to hyperbolic
-            for name, btn in self.func_buttons_row1.items():
-                btn.config(text=name + "h")
-            for name, btn in self.func_buttons_row2.items():
-                btn.config(text=name.replace('a', '') + "h\u207b\u00b9")
-            self.func_buttons_row1['sin'].config(
-                command=lambda: self.insert_func("sinh"))
-            self.func_buttons_row1['cos'].config(
-                command=lambda: self.insert_func("cosh"))
-            self.func_buttons_row1['tan'].config(
-                command=lambda: self.insert_func("tanh"))
-            self.func_buttons_row2['asin'].config(
-                command=lambda: self.insert_func("asinh"))
-            self.func_buttons_row2['acos'].config(
-                command=lambda: self.insert_func("acosh"))
-            self.func_buttons_row2['atan'].config(
-                command=lambda: self.insert_func("atanh"))
-        else:
-            self.second_label.config(text="")
-            self.func_buttons_row1['sin'].config(
-                text="sin", command=lambda: self.insert_func("sin"))
-            self.func_buttons_row1['cos'].config(
-                text="cos", command=lambda: self.insert_func("cos"))
-            self.func_buttons_row1['tan'].config(
-                text="tan", command=lambda: self.insert_func("tan"))
-            self.func_buttons_row2['asin'].config(
-                text="sin\u207b\u00b9", command=lambda: self.insert_func("asin"))
-            self.func_buttons_row2['acos'].config(
-                text="cos\u207b\u00b9", command=lambda: self.insert_func("acos"))
-            self.func_buttons_row2['atan'].config(
-                text="tan\u207b\u00b9", command=lambda: self.insert_func("atan"))
+        self.second_label.config(text="2nd" if self.second_mode else "")
+        for key in KEYPAD:
+            if key.name not in SECOND_FUNCTIONS:
+                continue
+            label, func = key.label, key.arg
+            if self.second_mode:
+                label, func = SECOND_FUNCTIONS[key.name]
+            self.keypad[key.name].config(
+                text=label, command=partial(self.insert_func, func))
 
     # --- Memory Functions ---
 
@@ -705,9 +1902,127 @@ class ScientificCalculator:
         except Exception:
             pass
 
+    # --- Function Table ---
+
+    def toggle_table(self):
+        width, height = self.root.winfo_width(), self.root.winfo_height()
+        if self.table_frame is None:
+            self._build_table(self.main_frame)
+            self._table_apply()
+        if self.table_frame.winfo_ismapped():
+            self.table_frame.grid_remove()
+            self.main_frame.columnconfigure(2, weight=0)
+            self.root.geometry(f"{max(width - 300, 780)}x{height}")
+        else:
+            self.table_frame.grid(row=0, column=2, sticky="nsew", padx=(4, 2), pady=2)
+            self.main_frame.columnconfigure(2, weight=1)
+            self.root.geometry(f"{width + 300}x{height}")
+
+    def _table_apply(self):
+        values = self.table_vars
+        try:
+            compiled = self.evaluator.compile(
+                self._prepare_expression(values['expr'].get()), ['x'])
+            start = self.evaluator.compile(values['start'].get())()
+            step = self.evaluator.compile(values['step'].get())()
+            rows = self.evaluator.compile(values['rows'].get())()
+            if isinstance(rows, float) and rows.is_integer():
+                rows = int(rows)
+            if not all(isinstance(v, (int, float)) for v in (start, step)) \
+                    or not isinstance(rows, int):
+                raise ValueError("start and step must be numbers, rows an integer")
+            self.table = FunctionTable(compiled, start, step, rows)
+        except (ArithmeticError, ValueError) as exc:
+            messagebox.showerror("Table", str(exc))
+            return
+        self._table_top = 0
+        self._table_schedule_render()
+
+    def _table_resize(self, event):
+        line = self.font_history.metrics("linespace") + 1
+        self._table_visible = max(1, event.height // line)
+        self._table_schedule_render()
+
+    def _table_scroll(self, command, amount, unit=None):
+        if self.table is None:
+            return
+        if command == "moveto":
+            self._table_top = int(float(amount) * self.table.rows)
+        elif unit == "pages":
+            self._table_top += int(amount) * self._table_visible
+        else:
+            self._table_top += int(amount)
+        self._table_schedule_render()
+
+    def _table_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._table_scroll("scroll", -3, "units")
+        else:
+            self._table_scroll("scroll", 3, "units")
+        return "break"
+
+    def _table_jump(self):
+        if self.table is None:
+            return
+        try:
+            x = self.evaluator.compile(self.table_vars['jump'].get())()
+            index = self.table.index_of(x)
+        except (ArithmeticError, ValueError, TypeError) as exc:
+            messagebox.showerror("Table", str(exc))
+            return
+        self._table_top = index - self._table_visible // 2
+        self._table_schedule_render()
+
+    def _table_click(self, event):
+        sel = self.table_list.curselection()
+        if not sel or self.table is None:
+            return
+        x, y = self.table.window(self._table_top + sel[0], 1)[0]
+        if isinstance(y, Exception):
+            return
+        try:
+            text, formatted = str(y), self._format_result(y)
+        except (ArithmeticError, ValueError):
+            return
+        self.expression = text
+        self.result_displayed = True
+        self._set_display(formatted)
+
+    def _table_value(self, y):
+        """Display text for a table row's value; "undefined" on any failure."""
+        if isinstance(y, Exception):
+            return "undefined"
+        try:
+            return self._format_result(y)
+        except (ArithmeticError, ValueError):
+            return "undefined"
+
+    def _table_schedule_render(self):
+        # Coalesce bursts of scroll events into one redraw
+        if not self._table_render_pending:
+            self._table_render_pending = True
+            self.root.after_idle(self._table_render)
+
+    def _table_render(self):
+        self._table_render_pending = False
+        if self.table is None:
+            return
+        total = self.table.rows
+        visible = self._table_visible
+        self._table_top = max(0, min(self._table_top, total - visible))
+        lines = []
+        for x, y in self.table.window(self._table_top, visible):
+            lines.append(f"{self._format_result(x):>10}  {self._table_value(y)}")
+        self.table_list.delete(0, tk.END)
+        self.table_list.insert(tk.END, *lines)
+        self.table_scrollbar.set(self._table_top / total,
+                                 min(1.0, (self._table_top + visible) / total))
+
     # --- History ---
 
     def _update_history_list(self):
+        if self.history_list is None:
+            return
         self.history_list.delete(0, tk.END)
         for expr, result in reversed(self.history):
             self.history_list.insert(tk.END, f" {expr}")
@@ -728,7 +2043,7 @@ class ScientificCalculator:
 
     def clear_history(self):
         self.history.clear()
-        self.history_list.delete(0, tk.END)
+        self._update_history_list()
 
     # --- Clipboard ---
 
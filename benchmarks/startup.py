@@ -0,0 +1,72 @@
+"""Startup benchmark: time from ``tk.Tk()`` to the calculator's first frame.
+
+Needs a display.  On headless machines run it under a virtual one:
+
+    xvfb-run -a python benchmarks/startup.py [runs]
+
+Each run builds the calculator in a fresh Tk interpreter and reports
+"first frame" (the first Visibility event, before any deferred work runs)
+and "ready" (the deferred widgets such as the history panel are built).
+"""
+
+import importlib.util
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        os.pardir, "Scientific Calculator.py")
+TIMEOUT = 10.0  # seconds to wait for the first frame and deferred widgets
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("scientific_calculator", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_startup(module):
+    start = time.perf_counter()
+    stamps = {}
+    root = tk.Tk()
+    # Stamp the first Visibility event directly: waiting with
+    # wait_visibility()/update_idletasks() would also drain the idle queue,
+    # which already holds _build_deferred by then.
+    root.bind("<Visibility>",
+              lambda e: stamps.setdefault("first_frame", time.perf_counter()),
+              add="+")
+    app = module.ScientificCalculator(root)
+
+    deadline = start + TIMEOUT
+    while "first_frame" not in stamps or not app.deferred_built:
+        if time.perf_counter() > deadline:
+            root.destroy()
+            missing = "first frame" if "first_frame" not in stamps else "deferred widgets"
+            sys.exit(f"Timed out after {TIMEOUT:g} s waiting for the {missing}")
+        root.update()
+    ready = time.perf_counter() - start
+    first_frame = stamps["first_frame"] - start
+    root.destroy()
+    return first_frame, ready
+
+
+def main(argv):
+    runs = int(argv[1]) if len(argv) > 1 else 20
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        sys.exit("No display found; run under xvfb-run -a")
+
+    module = load_app()
+    time_startup(module)  # warm-up: font cache, Tcl package loading
+
+    results = [time_startup(module) for _ in range(runs)]
+    for label, column in (("first frame", 0), ("ready", 1)):
+        samples = [r[column] * 1000 for r in results]
+        print(f"{label:>12}: median {statistics.median(samples):7.2f} ms  "
+              f"min {min(samples):7.2f} ms  max {max(samples):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
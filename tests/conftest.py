@@ -0,0 +1,23 @@
+import importlib.util
+import pathlib
+
+import pytest
+
+APP_PATH = pathlib.Path(__file__).resolve().parent.parent / "Scientific Calculator.py"
+
+
+def _load_app():
+    spec = importlib.util.spec_from_file_location("scientific_calculator", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def calc():
+    return _load_app()
+
+
+@pytest.fixture
+def evaluator(calc):
+    return calc.SafeEvaluator()
@@ -0,0 +1,93 @@
+import ast
+import math
+
+import pytest
+
+
+@pytest.mark.parametrize("p", range(0, 8))
+def test_power_sum_matches_direct_sum(calc, p):
+    for n in (0, 1, 2, 10, 257):
+        assert calc._power_sum(p, n) == sum(k ** p for k in range(1, n + 1))
+
+
+def test_zeta_even_closed_forms(calc):
+    assert calc._zeta_even(2) == pytest.approx(math.pi ** 2 / 6, rel=1e-15)
+    assert calc._zeta_even(4) == pytest.approx(math.pi ** 4 / 90, rel=1e-15)
+
+
+@pytest.mark.parametrize("s, n", [(2, 1), (3, 1), (2, 300), (5, 7), (4, 10 ** 6)])
+def test_zeta_tail_matches_long_direct_sum(calc, s, n):
+    m = n + 200000
+    direct = math.fsum(k ** -s for k in range(n, m))
+    rest = m ** (1 - s) / (s - 1) + m ** -s / 2 + s * m ** (-s - 1) / 12
+    assert calc._zeta_tail(s, n) == pytest.approx(direct + rest, rel=1e-13)
+    if n == 1:
+        assert calc._zeta_tail(s, n) == pytest.approx(
+            {2: math.pi ** 2 / 6, 3: 1.2020569031595942}[s], rel=1e-15)
+
+
+@pytest.mark.parametrize("term, expected", [
+    ("3*k**2 + 2**k", {(2, 1): 3, (0, 2): 1}),
+    ("5/k**4", {(-4, 1): 5.0}),
+    ("(k+1)**2", {(2, 1): 1, (1, 1): 2, (0, 1): 1}),
+    ("sin(k)", None),
+    ("x*k", None),
+])
+def test_series_terms_decomposition(evaluator, term, expected):
+    node = ast.parse(term, mode='eval').body
+    assert evaluator._series_terms(node, 'k', {'x': False}) == expected
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("sum(k**2, k, 1, 10**6)", 333333833333500000),
+    ("sum(k**3, k, 1, 10**30)", (10 ** 30 * (10 ** 30 + 1) // 2) ** 2),
+    ("prod(k, k, 1, 20)", math.factorial(20)),
+    ("sum(1/k**2, k, 1, inf)", math.pi ** 2 / 6),
+    ("sum(0.5**k, k, 0, inf)", 2.0),
+    ("sum(k, k, 1, 4) m", None),
+])
+def test_closed_forms(evaluator, expression, expected):
+    result = evaluator.evaluate(expression)
+    if expected is None:
+        assert (result.value, result.unit) == (10, "m")
+    else:
+        assert result == pytest.approx(expected, rel=1e-15)
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("sum(1/k**2.5, k, 1, inf)", 1.341487257250917),
+    ("sum(1/k**1.1, k, 1, inf)", 10.584448464950809),
+    ("sum(1/k**2, k, 300, inf)", 0.003338895061714),
+    ("sum(1/k**3, k, 1000, inf)", 5.005002499999e-07),
+    ("sum((-1)**k/k, k, 1, inf)", -math.log(2)),
+    ("sum(1/factorial(k), k, 0, inf)", math.e),
+    ("prod(1+1/k**2, k, 1, inf)", math.sinh(math.pi) / math.pi),
+    ("prod(1-1/(2*k)**2, k, 1, inf)", 2 / math.pi),
+])
+def test_infinite_series_converge(evaluator, expression, expected):
+    assert evaluator.evaluate(expression) == pytest.approx(expected, rel=1e-11)
+
+
+@pytest.mark.parametrize("expression", [
+    "sum(1/k, k, 1, inf)",
+    "sum(2**k, k, 0, inf)",
+    "sum((-1)**k, k, 0, inf)",
+    "sum(floor(k/1000), k, 0, inf)",
+    "sum((-1)**k + 0.5**k, k, 0, inf)",
+    "prod(-1, k, 1, inf)",
+    "prod((-1)**k*(1+1/k**2), k, 1, inf)",
+])
+def test_divergent_series_are_rejected(evaluator, expression):
+    with pytest.raises(ValueError, match="did not converge"):
+        evaluator.evaluate(expression)
+
+
+@pytest.mark.parametrize("expression", [
+    "prod(k, k, 1, 10**6)",
+    "prod(2, k, 1, 10**8)",
+    "sum(2**k, k, 0, 10**8)",
+    "sum(k, k, 1, 10**5000)",
+])
+def test_integer_results_are_capped(evaluator, expression):
+    with pytest.raises(OverflowError):
+        evaluator.evaluate(expression)
@@ -0,0 +1,79 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def table(calc, evaluator):
+    compiled = evaluator.compile("sqrt(x)", variables=("x",))
+    return calc.FunctionTable(compiled, -5, 1, 10 ** 19)
+
+
+def test_window_computes_rows_on_demand(table):
+    rows = table.window(3, 4)
+    assert [x for x, _ in rows] == [-2, -1, 0, 1]
+    assert isinstance(rows[0][1], ValueError)   # sqrt of a negative x
+    assert rows[2:] == [(0, 0.0), (1, 1.0)]
+
+
+def test_rows_beyond_ssize_t_work(table):
+    last = table.rows - 1
+    assert table.index_of(1e30) == last
+    (x, y), = table.window(last, 5)
+    assert x == table.x(last)
+    assert y == pytest.approx(math.sqrt(x))
+
+
+@pytest.mark.parametrize("expression, first", [
+    ("factorial(x)", 5000),
+    ("factorial(x)", 10 ** 6),
+    ("x**x", 20000),
+])
+def test_rows_too_large_to_show_render_as_undefined(calc, evaluator, expression, first):
+    compiled = evaluator.compile(expression, variables=("x",))
+    table = calc.FunctionTable(compiled, 0, 1, 10 ** 7)
+    app = SimpleNamespace()
+    app._format_result = lambda v: calc.ScientificCalculator._format_result(app, v)
+    rows = table.window(first, 8)
+    assert all(isinstance(y, OverflowError) for _, y in rows)
+    values = [calc.ScientificCalculator._table_value(app, y) for _, y in rows]
+    assert values == ["undefined"] * 8
+    assert calc.ScientificCalculator._table_value(app, 2 ** 20) == "1048576"
+
+
+def test_index_of_rounds_and_clamps(calc, evaluator):
+    compiled = evaluator.compile("x**2", variables=("x",))
+    table = calc.FunctionTable(compiled, 0, 0.5, 100)
+    assert table.index_of(1.2) == 2
+    assert table.index_of(-3) == 0
+    assert table.index_of(1000) == 99
+    assert table.window(98, 10) == [(49.0, 2401.0), (49.5, 2450.25)]
+
+
+def test_block_cache_is_bounded(calc, table):
+    for block in range(calc.TABLE_CACHE_BLOCKS + 10):
+        table.window(block * calc.TABLE_BLOCK_ROWS, 1)
+    assert len(table._blocks) == calc.TABLE_CACHE_BLOCKS
+    # The least recently used blocks were dropped first
+    assert 0 not in table._blocks and 9 not in table._blocks
+    assert calc.TABLE_CACHE_BLOCKS + 9 in table._blocks
+
+
+def test_recent_use_keeps_a_block(calc, table):
+    table.window(0, 1)
+    for block in range(1, calc.TABLE_CACHE_BLOCKS + 5):
+        table.window(0, 1)
+        table.window(block * calc.TABLE_BLOCK_ROWS, 1)
+    assert 0 in table._blocks
+
+
+@pytest.mark.parametrize("expression, step, rows, message", [
+    ("x + uniform(0, 1)", 1, 10, "uncertain"),
+    ("x", 0, 10, "step"),
+    ("x", 1, 0, "at least one row"),
+])
+def test_invalid_tables_are_rejected(calc, evaluator, expression, step, rows, message):
+    with pytest.raises(ValueError, match=message):
+        compiled = evaluator.compile(expression, variables=("x",))
+        calc.FunctionTable(compiled, 0, step, rows)
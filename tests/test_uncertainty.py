@@ -0,0 +1,72 @@
+import pytest
+
+
+@pytest.mark.parametrize("expression, mean, std", [
+    ("10 ± 1 + 5", 15, 1),
+    ("5 + 10 +/- 1", 15, 1),
+    ("2 * (3 ± 0.1)", 6, 0.2),
+    ("-5 ± 1", -5, 1),
+])
+def test_plus_minus_binds_to_its_neighbours(evaluator, expression, mean, std):
+    result = evaluator.evaluate(expression)
+    assert result.mean == pytest.approx(mean, abs=0.02)
+    assert result.std == pytest.approx(std, rel=0.02)
+
+
+@pytest.mark.parametrize("expression", ["3 | 4", "3 @ 4", "1 | (2 ± 1)"])
+def test_bitwise_and_matmul_operators_are_rejected(evaluator, expression):
+    with pytest.raises(ValueError, match="Unsupported operator"):
+        evaluator.evaluate(expression)
+
+
+def test_plain_expressions_are_not_uncertain(evaluator):
+    assert not evaluator.compile("3 + 4").uncertain
+    assert evaluator.compile("3 ± 4").uncertain
+    assert evaluator.compile("uniform(1, 2)").uncertain
+
+
+def test_runs_are_reproducible(evaluator):
+    compiled = evaluator.compile("sin(1 ± 0.1)**2 + uniform(1, 2)")
+    # No time budget: a slow machine must not cut the run short here
+    first, second = (compiled.sample(time_budget=None) for _ in range(2))
+    assert (first.mean, first.std, first.percentiles) == \
+        (second.mean, second.std, second.percentiles)
+    assert first.samples == 200_000 and not first.truncated
+    assert compiled.sample(seed=2, time_budget=None).mean != first.mean
+
+
+def test_time_budget_marks_results_cut_short(calc, evaluator):
+    compiled = evaluator.compile("1 ± 1")
+    result = compiled.sample(samples=10 * calc.MC_BATCH, time_budget=0)
+    assert result.truncated
+    assert result.samples == calc.MC_BATCH
+    assert not compiled.sample(samples=1000, time_budget=None).truncated
+
+
+def test_units_carry_through(evaluator):
+    result = evaluator.evaluate("(9.81 ± 0.02) m/s**2 * (2 ± 0.1) s in km/h")
+    assert result.unit == "km/h"
+    assert result.mean == pytest.approx(9.81 * 2 * 3.6, rel=1e-3)
+    assert result.std == pytest.approx(9.81 * 0.1 * 3.6, rel=0.05)
+    with pytest.raises(ValueError, match="matching units"):
+        evaluator.evaluate("5 m ± 1 s")
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("uniform(2, 1)", "low <= high"),
+    ("5 ± -1", "must not be negative"),
+    ("(-1 ± 0.5)**0.5", "not a real number"),
+])
+def test_invalid_distributions_are_rejected(evaluator, expression, message):
+    with pytest.raises(ValueError, match=message):
+        evaluator.evaluate(expression)
+
+
+def test_errors_inside_the_expression_keep_their_message(evaluator):
+    with pytest.raises(TypeError, match="integer"):
+        evaluator.evaluate("factorial(5 ± 1)")
+
+
+def test_sample_count_must_be_positive(evaluator):
+    with pytest.raises(ValueError, match="at least one sample"):
+        evaluator.compile("1 ± 1").sample(samples=0)
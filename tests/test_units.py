@@ -0,0 +1,89 @@
+import math
+
+import pytest
+
+
+def test_plain_arithmetic_is_unchanged(evaluator):
+    assert evaluator.evaluate("2**100") == 2 ** 100
+    assert evaluator.evaluate("factorial(20)") == math.factorial(20)
+    assert evaluator.evaluate("round(2.567, 2)") == 2.57
+
+
+def test_unit_table_is_interned(calc):
+    assert calc._dim(1) is calc.LENGTH
+    assert calc.UNITS['km'] == (1000.0, calc.LENGTH)
+    assert calc.UNITS['kg'][1] is calc.MASS
+
+
+@pytest.mark.parametrize("expression, value, unit", [
+    ("10 m / 2 s", 5.0, "m/s"),
+    ("5 km/h", 5000 / 3600, "m/s"),
+    ("3 m**2", 3, "m**2"),
+    ("2 s**-1", 2.0, "1/s"),
+    ("(2+3) m / 5 s", 1.0, "m/s"),
+    ("sqrt(16) m", 4.0, "m"),
+    ("10 m/s**2 * 2 kg", 20.0, "N"),
+    ("-5 m", -5, "m"),
+    ("10**3 m", 1000, "m"),
+    ("1.5*10**3 km", 1.5e6, "m"),
+    ("2**3 kg", 8, "kg"),
+    ("2**-1 s", 0.5, "s"),
+])
+def test_quantity_literals_bind_as_one_value(evaluator, expression, value, unit):
+    result = evaluator.evaluate(expression)
+    assert result.value == pytest.approx(value)
+    assert result.unit == unit
+
+
+def test_insert_unit_products_groups_literals(evaluator):
+    assert evaluator._insert_unit_products("10 m / 2 s", {}) == "(10 *m) / (2 *s)"
+    assert evaluator._insert_unit_products("3 m**2", {}) == "(3 *m**2)"
+    assert evaluator._insert_unit_products("10**3 m", {}) == "(10**3 *m)"
+    # Names that are variables or constants are left alone
+    assert evaluator._insert_unit_products("2 e", {}) == "2 e"
+    assert evaluator._insert_unit_products("2 m", {'m': False}) == "2 m"
+
+
+@pytest.mark.parametrize("expression, magnitude, unit", [
+    ("3 ft in inch", 36.0, "inch"),
+    ("60 mph in kph", 96.56064, "kph"),
+    ("2 kWh in J", 7.2e6, "J"),
+])
+def test_conversion(evaluator, expression, magnitude, unit):
+    result = evaluator.evaluate(expression)
+    assert result.magnitude == pytest.approx(magnitude)
+    assert result.unit == unit
+
+
+@pytest.mark.parametrize("expression", [
+    "5 m + 3 s", "sin(3 m)", "5 m in s", "2 ** (3 m)", "(1 m) ** x",
+])
+def test_dimension_errors_raise_at_compile_time(evaluator, expression):
+    with pytest.raises(ValueError):
+        evaluator.compile(expression, ['x'])
+
+
+def test_compiled_expression_reuses_checked_dimensions(evaluator, calc):
+    compiled = evaluator.compile("x*m / (2 s)", ['x'])
+    assert compiled.dim is calc.VELOCITY
+    assert compiled(x=10).value == pytest.approx(5.0)
+
+
+def test_literal_parts_are_folded_at_compile_time(evaluator):
+    compiled = evaluator.compile("x*m/(2 s) + 3 km/h", ['x'])
+    assert compiled.unit == ("m/s", 1)
+    assert compiled(x=1).value == pytest.approx(0.5 + 3 / 3.6)
+    with pytest.raises(ZeroDivisionError):
+        evaluator.compile("x + 1/0", ['x'])
+
+
+def test_quantity_str_round_trips(evaluator):
+    result = evaluator.evaluate("5 km/h in m/s")
+    again = evaluator.evaluate(str(result))
+    assert again.value == pytest.approx(result.value)
+    assert again.dim is result.dim
+
+
+def test_ans_keeps_units(evaluator):
+    evaluator.evaluate("2 kWh")
+    assert evaluator.evaluate("ans in kJ").magnitude == pytest.approx(7200)